@@ -3,7 +3,7 @@
 import logging
 import sys
 from asyncio import LifoQueue
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, Path, Query, Request
 
@@ -104,7 +104,18 @@ async def get_deadline_from_query(
 
     if isinstance(deadline, str):
         try:
-            deadline_obj = datetime.strptime(deadline, "%Y-%m-%dT%H:%M:%SZ")
+            deadline_obj = datetime.fromisoformat(deadline)
+            if deadline_obj.tzinfo is None:
+                # Don't guess the timezone of dates or naive times.
+                raise ValueError(
+                    "deadline %s has no timezone; expected 'Z' or an offset"
+                    % repr(deadline)
+                )
+            # Deadlines are stored and compared as naive UTC timestamps.
+            # This can overflow for offsets at the ends of the date range.
+            deadline_obj = deadline_obj.astimezone(timezone.utc).replace(
+                tzinfo=None
+            )
         except Exception as exc_info:
             raise HTTPException(
                 status_code=400, detail=repr(exc_info)
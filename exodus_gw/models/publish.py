@@ -34,7 +34,11 @@ class Publish(Base):
     state: Mapped[str] = mapped_column(String)
     updated: Mapped[datetime | None] = mapped_column(DateTime())
     items = relationship(
-        "Item", back_populates="publish", cascade="all, delete-orphan"
+        "Item",
+        back_populates="publish",
+        cascade="all, delete-orphan",
+        # Served by the (publish_id, web_uri) unique index on items.
+        order_by="Item.web_uri",
     )
 
     def resolve_links(
@@ -86,7 +90,8 @@ class Publish(Base):
             ln_items = [i for i in ln_items if i.link_to]
 
         # Collect link targets of linked items for finding matches.
-        ln_item_paths = [item.link_to for item in ln_items]
+        # This is a set since it's also used for membership checks below.
+        ln_item_paths = {item.link_to for item in ln_items}
 
         # Store only necessary fields from matching items to conserve memory.
         match_bundle: Bundle[Any] = Bundle(
@@ -113,7 +113,7 @@ from uuid import uuid4
 
 from fastapi import APIRouter, Body, HTTPException, Query
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session, noload
+from sqlalchemy.orm import Session, noload, raiseload
 
 from .. import auth, deps, models, schemas, worker
 from ..settings import Environment, Settings
@@ -304,7 +304,7 @@ def update_publish_items(
         # Determine whether the client is authorized to publish to this URI.
         authorized = False
         for pattern in path_patterns:
-            if re.match(pattern, i.web_uri):
+            if pattern.match(i.web_uri):
                 authorized = True
                 break
         if not authorized:
@@ -488,6 +488,9 @@ def commit_publish(
         # Publish should be locked, but if doing a phase1 commit we will only
         # be reading from the publish and not writing to it.
         .with_for_update(read=(commit_mode_str == models.CommitModes.phase1))
+        # Commit never needs the full list of items; links are resolved
+        # with dedicated queries. Make sure they're never lazy-loaded.
+        .options(raiseload(models.Publish.items))
         .filter(
             models.Publish.id == publish_id,
             models.Publish.env == env.name,
@@ -110,7 +110,7 @@ class ItemBase(BaseModel):
                         "Cannot set content type when object_key is 'absent': %s"
                         % data
                     )
-            elif not re.match(SHA256SUM_PATTERN, object_key):
+            elif not SHA256SUM_PATTERN.fullmatch(object_key):
                 raise ValueError(
                     "Invalid object key; must be sha256sum: %s" % data
                 )
@@ -119,7 +119,7 @@ class ItemBase(BaseModel):
 
         if content_type:
             # Enforce MIME type structure
-            if not re.match(MIMETYPE_PATTERN, content_type):
+            if not MIMETYPE_PATTERN.match(content_type):
                 raise ValueError("Invalid content type: %s" % data)
 
         # It's not permitted to explicitly *write* to the autoindex filename,
@@ -162,7 +162,7 @@ class ItemBase(BaseModel):
             raise ItemPolicyError(message)
 
         # All content under /origin/files/sha256 must match the regex
-        if not re.match(ORIGIN_FILES_PATTERN, self.web_uri):
+        if not ORIGIN_FILES_PATTERN.match(self.web_uri):
             policy_error(
                 f"Origin path {self.web_uri} does not match regex {ORIGIN_FILES_PATTERN.pattern}"
             )
@@ -63,8 +63,7 @@ def test_db_implicit_commit(db):
     assert r.status_code == 200
 
     # Should have committed, even though we didn't explicitly request it
-    publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-    assert publishes.count() == 1
+    assert db.get(Publish, TEST_UUID) is not None
 
 
 def test_db_explicit_commit(db):
@@ -77,8 +76,7 @@ def test_db_explicit_commit(db):
     assert r.status_code == 200
 
     # Should have committed, as requested
-    publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-    assert publishes.count() == 1
+    assert db.get(Publish, TEST_UUID) is not None
 
 
 def test_db_rollback(db):
@@ -91,8 +89,7 @@ def test_db_rollback(db):
     assert r.status_code == 200
 
     # Should not have committed anything since we explicitly rolled back
-    publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-    assert publishes.count() == 0
+    assert db.get(Publish, TEST_UUID) is None
 
 
 def test_db_rollback_on_raise(db):
@@ -105,8 +102,7 @@ def test_db_rollback_on_raise(db):
     assert r.status_code == 500
 
     # Should not have committed anything since exception was raised
-    publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-    assert publishes.count() == 0
+    assert db.get(Publish, TEST_UUID) is None
 
 
 def test_db_rollback_on_raise_db(db):
@@ -126,8 +122,7 @@ def test_db_rollback_on_raise_db(db):
         assert len(r.headers["X-Request-ID"]) == 8
 
         # Should not have committed anything since exception was raised
-        publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-        assert publishes.count() == 0
+        assert db.get(Publish, TEST_UUID) is None
 
 
 def test_db_raise_error_and_resolve(db):
@@ -144,5 +139,4 @@ def test_db_raise_error_and_resolve(db):
     assert r.status_code == 200
 
     # Should have committed something since exception was retried and resolved
-    publishes = db.query(Publish).filter(Publish.id == TEST_UUID)
-    assert publishes.count() == 1
+    assert db.get(Publish, TEST_UUID) is not None
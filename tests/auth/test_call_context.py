@@ -1,7 +1,7 @@
 import base64
 import json
+from unittest import mock
 
-import mock
 import pytest
 from fastapi import HTTPException
 
@@ -1,4 +1,4 @@
-import mock
+from unittest import mock
 
 from exodus_gw.aws.util import content_md5
 
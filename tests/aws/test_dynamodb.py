@@ -2,8 +2,8 @@ import json
 import logging
 import re
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
-import mock
 import pytest
 from botocore.exceptions import EndpointConnectionError
 
@@ -1,20 +1,32 @@
 import base64
+import functools
 import json
 import os
+import shutil
 from datetime import datetime
 from typing import Any
+from unittest import mock
 
 import dramatiq
-import mock
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm.session import Session
 
-from exodus_gw import database, main, models, settings  # noqa
+from exodus_gw import database, main, migrate, models, settings  # noqa
 from exodus_gw.dramatiq import Broker
+from exodus_gw.logging import JsonFormatter
 
 from .async_utils import BlockDetector
 
+# sqlite DB file used by any 'real' usage of sqlalchemy during tests.
+# When tests are distributed with pytest-xdist, each worker process gets
+# its own file, so workers don't delete each other's DB.
+TEST_DB_FILENAME = "exodus-gw-test%s.db" % (
+    "-" + os.environ["PYTEST_XDIST_WORKER"]
+    if "PYTEST_XDIST_WORKER" in os.environ
+    else ""
+)
+
 
 async def fake_aexit_instancemethod(self, exc_type, exc_val, exc_tb):
     pass
@@ -89,17 +101,16 @@ def sqlite_in_tests(monkeypatch):
     exercise all the ORM code, or may inject mock DB sessions into endpoints.
     """
 
-    filename = "exodus-gw-test.db"
-
     try:
         # clean before test
-        os.remove(filename)
+        os.remove(TEST_DB_FILENAME)
     except FileNotFoundError:
         # no problem
         pass
 
     monkeypatch.setenv(
-        "EXODUS_GW_DB_URL", "sqlite:///%s?check_same_thread=false" % filename
+        "EXODUS_GW_DB_URL",
+        "sqlite:///%s?check_same_thread=false" % TEST_DB_FILENAME,
     )
     yield
 
@@ -128,27 +139,69 @@ def unmigrated_db():
     a test wants a DB with all tables in place, use 'db' instead.
     """
 
-    session = Session(bind=database.db_engine(settings.Settings()))
+    engine = database.db_engine(settings.Settings())
+    session = Session(bind=engine)
     try:
         yield session
     finally:
         session.close()
+        # Release pooled connections, so they don't outlive the DB file
+        # which is removed before the next test.
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def migrated_db_template(tmp_path_factory):
+    """Path to a sqlite DB file with the schema deployed.
+
+    This is created once per session so that each test needing a DB with
+    all tables in place can start from a copy of it, rather than running
+    all migrations again.
+    """
+
+    path = tmp_path_factory.mktemp("exodus-gw-db") / TEST_DB_FILENAME
+    template_settings = settings.Settings(
+        db_url="sqlite:///%s?check_same_thread=false" % path
+    )
+
+    engine = database.db_engine(template_settings)
+    try:
+        migrate.db_migrate(engine, template_settings)
+    finally:
+        engine.dispose()
+
+    return path
 
 
 @pytest.fixture()
-def db(unmigrated_db):
+def db(unmigrated_db, migrated_db_template):
     """Yields a real DB session configured using current settings.
 
     This session has the schema deployed prior to yielding, so the
     test may assume all tables are already in place.
     """
 
-    with TestClient(main.app):
-        pass
+    shutil.copyfile(migrated_db_template, TEST_DB_FILENAME)
 
     return unmigrated_db
 
 
+@pytest.fixture()
+def client(request):
+    """Yields a TestClient for the app, started up for the duration of the test.
+
+    Tests should use this rather than entering their own TestClient, unless
+    they need to adjust settings before app startup.
+    """
+
+    if "db" in request.fixturenames:
+        # The DB must be in place before the app starts using it.
+        request.getfixturevalue("db")
+
+    with TestClient(main.app) as client:
+        yield client
+
+
 @pytest.fixture(autouse=True, scope="session")
 def db_session_block_detector():
     """Wrap DB sessions created by the app with an object to detect
@@ -164,6 +217,17 @@ def db_session_block_detector():
         yield
 
 
+@pytest.fixture(autouse=True)
+def json_caplog(caplog):
+    """Format captured logs as JSON, as loggers_init does for the app.
+
+    Without this, caplog's format would depend on whether some earlier
+    test in the same process happened to call loggers_init.
+    """
+    caplog.handler.setFormatter(JsonFormatter())
+    yield caplog
+
+
 @pytest.fixture()
 def fake_publish():
     publish = models.Publish(
@@ -200,22 +264,32 @@ def fake_publish():
     yield publish
 
 
+@functools.lru_cache(maxsize=32)
+def _encoded_call_context(roles: tuple[str, ...]) -> str:
+    # Encoding is the same for every test using a given set of roles,
+    # so it's only done once per distinct set.
+    raw_context = {
+        "user": {
+            "authenticated": True,
+            "internalUsername": "fake-user",
+            "roles": list(roles),
+        }
+    }
+
+    json_context = json.dumps(raw_context).encode("utf-8")
+    b64_context = base64.b64encode(json_context)
+
+    return b64_context.decode("utf-8")
+
+
 @pytest.fixture
 def auth_header():
     def _auth_header(roles: list[str] = []):
-        raw_context = {
-            "user": {
-                "authenticated": True,
-                "internalUsername": "fake-user",
-                "roles": roles,
-            }
+        # A new dict is returned each time, so tests are free to modify it.
+        return {
+            "X-RhApiPlatform-CallContext": _encoded_call_context(tuple(roles))
         }
 
-        json_context = json.dumps(raw_context).encode("utf-8")
-        b64_context = base64.b64encode(json_context)
-
-        return {"X-RhApiPlatform-CallContext": b64_context.decode("utf-8")}
-
     return _auth_header
 
 
@@ -115,14 +115,13 @@ def test_cdn_access_invalid_resource(
     }
 
 
-def test_cdn_access_unauthed(auth_header):
+def test_cdn_access_unauthed(auth_header, client):
     """cdn-access endpoint forbids usage if caller is missing needed role."""
 
-    with TestClient(app) as client:
-        response = client.get(
-            "/test/cdn-access?expire_days=60",
-            headers=auth_header(roles=["some-unrelated-role"]),
-        )
+    response = client.get(
+        "/test/cdn-access?expire_days=60",
+        headers=auth_header(roles=["some-unrelated-role"]),
+    )
 
     # It should have been forbidden.
     assert response.status_code == 403
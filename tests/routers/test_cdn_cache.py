@@ -1,20 +1,16 @@
-from fastapi.testclient import TestClient
-
-from exodus_gw.main import app
 from exodus_gw.models.dramatiq import DramatiqMessage
 
 
-def test_flush_cache_denied(auth_header, caplog):
+def test_flush_cache_denied(auth_header, caplog, client):
     """flush-cache denies request if user is missing role"""
-    with TestClient(app) as client:
-        response = client.post(
-            "/test/cdn-flush",
-            json=[
-                {"web_uri": "/path1"},
-                {"web_uri": "/path2"},
-            ],
-            headers=auth_header(roles=["irrelevant-role"]),
-        )
+    response = client.post(
+        "/test/cdn-flush",
+        json=[
+            {"web_uri": "/path1"},
+            {"web_uri": "/path2"},
+        ],
+        headers=auth_header(roles=["irrelevant-role"]),
+    )
 
     # It should be forbidden
     assert response.status_code == 403
@@ -23,18 +19,17 @@ def test_flush_cache_denied(auth_header, caplog):
     assert "Access denied; path=/test/cdn-flush" in caplog.text
 
 
-def test_flush_cache_typical(auth_header, db):
+def test_flush_cache_typical(auth_header, db, client):
     """flush-cache enqueues actor as expected in typical case"""
 
-    with TestClient(app) as client:
-        response = client.post(
-            "/test/cdn-flush",
-            json=[
-                {"web_uri": "/path1"},
-                {"web_uri": "/path2"},
-            ],
-            headers=auth_header(roles=["test-cdn-flusher"]),
-        )
+    response = client.post(
+        "/test/cdn-flush",
+        json=[
+            {"web_uri": "/path1"},
+            {"web_uri": "/path2"},
+        ],
+        headers=auth_header(roles=["test-cdn-flusher"]),
+    )
 
     # It should have succeeded
     assert response.status_code == 200
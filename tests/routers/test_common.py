@@ -4,7 +4,6 @@ import json
 
 import pytest
 from fastapi.routing import APIRoute
-from fastapi.testclient import TestClient
 from freezegun import freeze_time
 
 from exodus_gw.main import app
@@ -84,34 +83,33 @@ def test_requires_auth(api_route):
         "authenticated-auth-required",
     ],
 )
-def test_login_log(endpoint, user, roles, caplog, auth_header):
+def test_login_log(endpoint, user, roles, caplog, auth_header, client):
     """Every route produces a log describing a login event."""
-    with TestClient(app) as client:
-        if roles:
-            if endpoint == "/foo/publish":
-                r = client.post(
-                    endpoint, headers=auth_header(roles=["test-publisher"])
-                )
-            else:
-                r = client.get(
-                    endpoint, headers=auth_header(roles=["test-publisher"])
-                )
+    if roles:
+        if endpoint == "/foo/publish":
+            r = client.post(
+                endpoint, headers=auth_header(roles=["test-publisher"])
+            )
         else:
-            r = client.get(endpoint)
-        expected_log = {
-            "level": "INFO",
-            "logger": "exodus-gw",
-            "time": "2023-07-28 13:24:03.596",
-            "request_id": r.headers["X-Request-ID"],
-            "message": f"Login: path={endpoint}, user={user}, roles={roles}",
-            "event": "login",
-            "success": True,
-        }
-        if user == "<anonymous user>":
-            assert expected_log not in [
-                json.loads(line) for line in caplog.text.splitlines()
-            ]
-        else:
-            assert expected_log in [
-                json.loads(line) for line in caplog.text.splitlines()
-            ]
+            r = client.get(
+                endpoint, headers=auth_header(roles=["test-publisher"])
+            )
+    else:
+        r = client.get(endpoint)
+    expected_log = {
+        "level": "INFO",
+        "logger": "exodus-gw",
+        "time": "2023-07-28 13:24:03.596",
+        "request_id": r.headers["X-Request-ID"],
+        "message": f"Login: path={endpoint}, user={user}, roles={roles}",
+        "event": "login",
+        "success": True,
+    }
+    if user == "<anonymous user>":
+        assert expected_log not in [
+            json.loads(line) for line in caplog.text.splitlines()
+        ]
+    else:
+        assert expected_log in [
+            json.loads(line) for line in caplog.text.splitlines()
+        ]
@@ -1,16 +1,12 @@
 import pytest
-from fastapi.testclient import TestClient
 
-from exodus_gw.main import app
 
-
-def test_deploy_config_typical(fake_config, auth_header):
-    with TestClient(app) as client:
-        r = client.post(
-            "/test/deploy-config",
-            json=fake_config,
-            headers=auth_header(roles=["test-config-deployer"]),
-        )
+def test_deploy_config_typical(fake_config, auth_header, client):
+    r = client.post(
+        "/test/deploy-config",
+        json=fake_config,
+        headers=auth_header(roles=["test-config-deployer"]),
+    )
 
     # It should have succeeded and returned a task object
     assert r.status_code == 200
@@ -45,16 +41,15 @@ def test_deploy_config_typical(fake_config, auth_header):
         "additional_property",
     ],
 )
-def test_deploy_config_bad_config(data, fake_config, auth_header):
+def test_deploy_config_bad_config(data, fake_config, auth_header, client):
     # Add bad config data.
     fake_config.update(data)
 
-    with TestClient(app) as client:
-        r = client.post(
-            "/test/deploy-config",
-            json=fake_config,
-            headers=auth_header(roles=["test-config-deployer"]),
-        )
+    r = client.post(
+        "/test/deploy-config",
+        json=fake_config,
+        headers=auth_header(roles=["test-config-deployer"]),
+    )
 
     # It should have failed
     assert r.status_code == 400
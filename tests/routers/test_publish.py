@@ -1,20 +1,57 @@
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from unittest import mock
 
-import mock
 import pytest
 import sqlalchemy.orm
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
+from sqlalchemy import event
 
 from exodus_gw import routers, schemas
+from exodus_gw.auth import CallContext
 from exodus_gw.main import app
 from exodus_gw.models import CommitTask, Item, Publish, Task
 from exodus_gw.models.dramatiq import DramatiqMessage
 from exodus_gw.settings import Environment, Settings, get_environment
 
+# ID used for the publish in most tests here.
+PUBLISH_ID = "11224567-e89b-12d3-a456-426614174000"
+
+
+@pytest.fixture
+def publish(db):
+    """A PENDING publish in the 'test' environment, committed to the DB."""
+
+    publish = Publish(id=PUBLISH_ID, env="test", state="PENDING")
+    db.add(publish)
+    db.commit()
+
+    return publish
+
+
+@contextmanager
+def recorded_statements(engine):
+    """Yields a list which collects all SQL statements executed on
+    the given engine while the context is active.
+    """
+
+    statements: list[str] = []
+
+    def record_statement(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
 
 @pytest.mark.parametrize(
     "env",
@@ -24,12 +61,11 @@ from exodus_gw.settings import Environment, Settings, get_environment
         "test3",
     ],
 )
-def test_publish_env_exists(env, db, auth_header):
-    with TestClient(app) as client:
-        r = client.post(
-            "/%s/publish" % env,
-            headers=auth_header(roles=["%s-publisher" % env]),
-        )
+def test_publish_env_exists(env, db, auth_header, client):
+    r = client.post(
+        "/%s/publish" % env,
+        headers=auth_header(roles=["%s-publisher" % env]),
+    )
 
     # Should succeed
     assert r.status_code == 200
@@ -37,15 +73,14 @@ def test_publish_env_exists(env, db, auth_header):
     # Should have returned a publish object
     publish_id = r.json()["id"]
 
-    publishes = db.query(Publish).filter(Publish.id == publish_id)
-    assert publishes.count() == 1
+    # And that publish should exist in the DB
+    assert db.get(Publish, publish_id) is not None
 
 
-def test_publish_env_doesnt_exist(auth_header):
-    with TestClient(app) as client:
-        r = client.post(
-            "/foo/publish", headers=auth_header(roles=["foo-publisher"])
-        )
+def test_publish_env_doesnt_exist(auth_header, client):
+    r = client.post(
+        "/foo/publish", headers=auth_header(roles=["foo-publisher"])
+    )
 
     # It should fail
     assert r.status_code == 404
@@ -76,10 +111,10 @@ def test_publish_links(mock_db_session):
     }
 
 
-def test_update_publish_items_typical(db, auth_header):
+def test_update_publish_items_typical(db, auth_header, client):
     """PUTting some items on a publish creates expected objects in DB."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
     publish = Publish(id=publish_id, env="test", state="PENDING")
 
@@ -104,50 +139,51 @@ def test_update_publish_items_typical(db, auth_header):
     db.add(publish)
     db.commit()
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri1",
-                    "object_key": "1" * 64,
-                    "content_type": "application/octet-stream",
-                },
-                {
-                    "web_uri": "/uri2",
-                    "object_key": "2" * 64,
-                    "content_type": "application/octet-stream",
-                },
-                {
-                    # This item links to another item in the same request.
-                    "web_uri": "/uri3",
-                    "link_to": "/uri1",
-                },
-                {
-                    "web_uri": "/uri4",
-                    "object_key": "absent",
-                },
-                {
-                    "web_uri": "/uri5",
-                    "link_to": "/unknown-target",
-                },
-                {
-                    # This item links to an existing item in the DB.
-                    "web_uri": "/uri6",
-                    "link_to": "/existing-target",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/uri1",
+                "object_key": "1" * 64,
+                "content_type": "application/octet-stream",
+            },
+            {
+                "web_uri": "/uri2",
+                "object_key": "2" * 64,
+                "content_type": "application/octet-stream",
+            },
+            {
+                # This item links to another item in the same request.
+                "web_uri": "/uri3",
+                "link_to": "/uri1",
+            },
+            {
+                "web_uri": "/uri4",
+                "object_key": "absent",
+            },
+            {
+                "web_uri": "/uri5",
+                "link_to": "/unknown-target",
+            },
+            {
+                # This item links to an existing item in the DB.
+                "web_uri": "/uri6",
+                "link_to": "/existing-target",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
 
+    # Items are not echoed back to the client
+    assert r.json() == {}
+
     # Publish object should now have matching items
     db.refresh(publish)
 
-    items = sorted(publish.items, key=lambda item: item.web_uri)
     item_dicts = [
         {
             "web_uri": item.web_uri,
@@ -155,7 +191,7 @@ def test_update_publish_items_typical(db, auth_header):
             "content_type": item.content_type,
             "link_to": item.link_to,
         }
-        for item in items
+        for item in publish.items
     ]
 
     # The update should have stored our passed items, and in some cases,
@@ -230,38 +266,17 @@ def test_update_publish_items_typical(db, auth_header):
     ]
 
 
-def test_update_publish_items_autoindex(db, auth_header):
-    """PUTting items including entry points will trigger a partial autoindex."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+def test_update_publish_items_single_insert(db, publish, auth_header, client):
+    """PUTting many items writes them all with a single INSERT statement."""
 
-    publish = Publish(id=publish_id, env="test", state="PENDING")
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add some items to it
+    with recorded_statements(client.app.state.db_engine) as statements:
         r = client.put(
             "/test/publish/%s" % publish_id,
             json=[
-                {
-                    "web_uri": "/some/repo1/repodata/repomd.xml",
-                    "object_key": "1" * 64,
-                },
-                {
-                    "web_uri": "/some/repo1/repodata/whatever",
-                    "object_key": "2" * 64,
-                },
-                {
-                    "web_uri": "/some/repo2/repodata/repomd.xml",
-                    "object_key": "3" * 64,
-                },
-                {
-                    "web_uri": "/some/repo3/repodata/repomd.xml",
-                    "object_key": "absent",
-                },
+                {"web_uri": "/uri%s" % i, "object_key": "%x" % i * 64}
+                for i in range(1, 16)
             ],
             headers=auth_header(roles=["test-publisher"]),
         )
@@ -269,6 +284,47 @@ def test_update_publish_items_autoindex(db, auth_header):
     # It should have succeeded
     assert r.status_code == 200
 
+    # All the items should have been written by one statement, rather
+    # than a statement per item.
+    item_inserts = [s for s in statements if s.startswith("INSERT INTO items")]
+    assert len(item_inserts) == 1
+
+    db.refresh(publish)
+    assert len(publish.items) == 15
+
+
+def test_update_publish_items_autoindex(db, publish, auth_header, client):
+    """PUTting items including entry points will trigger a partial autoindex."""
+
+    publish_id = PUBLISH_ID
+
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/some/repo1/repodata/repomd.xml",
+                "object_key": "1" * 64,
+            },
+            {
+                "web_uri": "/some/repo1/repodata/whatever",
+                "object_key": "2" * 64,
+            },
+            {
+                "web_uri": "/some/repo2/repodata/repomd.xml",
+                "object_key": "3" * 64,
+            },
+            {
+                "web_uri": "/some/repo3/repodata/repomd.xml",
+                "object_key": "absent",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
+
+    # It should have succeeded
+    assert r.status_code == 200
+
     # Check the enqueued messages...
     messages: list[DramatiqMessage] = db.query(DramatiqMessage).all()
 
@@ -292,36 +348,29 @@ def test_update_publish_items_autoindex(db, auth_header):
 
 
 def test_update_publish_items_autoindex_excluded(
-    db, auth_header, caplog: pytest.LogCaptureFixture
+    db, publish, auth_header, caplog: pytest.LogCaptureFixture, client
 ):
     """PUTting items including entry points under an excluded path will NOT trigger
     partial autoindex.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # Ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/some/kickstart/repo1/repodata/repomd.xml",
-                    "object_key": "1" * 64,
-                },
-                {
-                    "web_uri": "/some/kickstart/repo1/other",
-                    "object_key": "2" * 64,
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/some/kickstart/repo1/repodata/repomd.xml",
+                "object_key": "1" * 64,
+            },
+            {
+                "web_uri": "/some/kickstart/repo1/other",
+                "object_key": "2" * 64,
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
@@ -339,27 +388,22 @@ def test_update_publish_items_autoindex_excluded(
     )
 
 
-def test_update_publish_items_path_normalization(db, auth_header):
+def test_update_publish_items_path_normalization(
+    db, publish, auth_header, client
+):
     """URI and link target paths are normalized in PUT items."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Add an item to it with some messy paths
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {"web_uri": "some/path", "object_key": "1" * 64},
-                {"web_uri": "link/to/some/path", "link_to": "/some/path"},
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Add an item to it with some messy paths
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {"web_uri": "some/path", "object_key": "1" * 64},
+            {"web_uri": "link/to/some/path", "link_to": "/some/path"},
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
@@ -367,14 +411,13 @@ def test_update_publish_items_path_normalization(db, auth_header):
     # Publish object should now have matching items
     db.refresh(publish)
 
-    items = sorted(publish.items, key=lambda item: item.web_uri)
     item_dicts = [
         {
             "web_uri": item.web_uri,
             "object_key": item.object_key,
             "link_to": item.link_to,
         }
-        for item in items
+        for item in publish.items
     ]
 
     # Should have stored normalized web_uri and link_to paths (update now resolves links as well).
@@ -388,29 +431,28 @@ def test_update_publish_items_path_normalization(db, auth_header):
     ]
 
 
-def test_update_publish_items_invalid_publish(db, auth_header):
+def test_update_publish_items_invalid_publish(db, auth_header, client):
     """PUTting items on a completed publish fails with code 409."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
     publish = Publish(id=publish_id, env="test", state="COMPLETE")
 
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
+    # ensure a publish object exists
+    db.add(publish)
+    db.commit()
 
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri1",
-                    "object_key": "1" * 64,
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/uri1",
+                "object_key": "1" * 64,
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have failed with 409
     assert r.status_code == 409
@@ -419,49 +461,112 @@ def test_update_publish_items_invalid_publish(db, auth_header):
     }
 
 
-def test_update_publish_items_no_uri(db, auth_header):
-    """PUTting an item with no web_uri fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
+@pytest.mark.parametrize(
+    "item,expected_detail",
+    [
+        (
+            {"web_uri": "", "link_to": "/uri1"},
+            "No URI: {item}",
+        ),
+        (
+            {"web_uri": "/uri1"},
+            "No object key or link target: {item}",
+        ),
+        (
+            {
+                "web_uri": "/foo/bar/.__exodus_autoindex",
+                "object_key": "1" * 64,
+            },
+            "Invalid URI /foo/bar/.__exodus_autoindex: filename is reserved",
+        ),
+        (
+            {"web_uri": "/uri2", "object_key": "1" * 64, "link_to": "/uri1"},
+            "Both link target and object key present: {item}",
+        ),
+        (
+            {
+                "web_uri": "/uri2",
+                "link_to": "/uri1",
+                "content_type": "application/octet-stream",
+            },
+            "Content type specified for link: {item}",
+        ),
+        (
+            {
+                "web_uri": "/uri2",
+                "object_key": "somethingshyof64_with!non-alphanum$",
+            },
+            "Invalid object key; must be sha256sum: {item}",
+        ),
+        (
+            {
+                "web_uri": "/uri1",
+                "object_key": "absent",
+                "content_type": "application/octet-stream",
+            },
+            "Cannot set content type when object_key is 'absent': {item}",
+        ),
+        (
+            {
+                "web_uri": "/uri2",
+                "object_key": "1" * 64,
+                "content_type": "type_nosubtype",
+            },
+            "Invalid content type: {item}",
+        ),
+    ],
+    ids=[
+        "no_uri",
+        "no_key_or_link",
+        "autoindex",
+        "link_and_key",
+        "link_content_type",
+        "invalid_object_key",
+        "absent_content_type",
+        "invalid_content_type",
+    ],
+)
+def test_update_publish_items_invalid(
+    item, expected_detail, publish, auth_header, client
+):
+    """PUTting an invalid item fails validation with a meaningful error."""
 
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
+    publish_id = PUBLISH_ID
 
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "",
-                    "link_to": "/uri1",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add an item to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[item],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
+    # The item as seen by the server, with defaults filled in
     expected_item = {
         "web_uri": "",
         "object_key": "",
         "content_type": "",
-        "link_to": "/uri1",
+        "link_to": "",
     }
+    expected_item.update(item)
 
     # It should have failed with 400
     assert r.status_code == 400
-    assert r.json() == {"detail": ["Value error, No URI: %s" % expected_item]}
+
+    # It should tell the reason why
+    assert r.json() == {
+        "detail": [
+            "Value error, " + expected_detail.format(item=expected_item)
+        ]
+    }
     # It should include non-empty request header
     assert len(r.headers["X-Request-ID"]) == 8
 
 
 @freeze_time("2023-04-26 14:43:13+00:00")
-def test_update_publish_items_existing_uri(db, auth_header):
+def test_update_publish_items_existing_uri(db, auth_header, client):
     """PUTting an item which item's web_uri already exists creates expected objects in DB."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
     new_updated = datetime(2023, 4, 26, 14, 43, 13)
     prev_updated = new_updated - timedelta(hours=2)
@@ -488,22 +593,21 @@ def test_update_publish_items_existing_uri(db, auth_header):
         ],
     )
 
-    with TestClient(app) as client:
-        # Ensure a publish object exists
-        db.add(publish)
-        db.commit()
+    # Ensure a publish object exists
+    db.add(publish)
+    db.commit()
 
-        # Try to add an item which item's web_uri already exists
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri1",
-                    "object_key": "3" * 64,
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add an item which item's web_uri already exists
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/uri1",
+                "object_key": "3" * 64,
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
@@ -511,7 +615,6 @@ def test_update_publish_items_existing_uri(db, auth_header):
     # Publish object should now have matching items
     db.refresh(publish)
 
-    items = sorted(publish.items, key=lambda item: item.web_uri)
     item_dicts = [
         {
             "web_uri": item.web_uri,
@@ -519,7 +622,7 @@ def test_update_publish_items_existing_uri(db, auth_header):
             "dirty": item.dirty,
             "updated": item.updated,
         }
-        for item in items
+        for item in publish.items
     ]
 
     assert item_dicts == [
@@ -542,369 +645,80 @@ def test_update_publish_items_existing_uri(db, auth_header):
     ]
 
 
-def test_update_publish_items_invalid_item(db, auth_header):
-    """PUTting an item without object_key or link_to fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[{"web_uri": "/uri1"}],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri1",
-        "object_key": "",
-        "content_type": "",
-        "link_to": "",
-    }
-
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": [
-            "Value error, No object key or link target: %s" % expected_item
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_items_rejects_autoindex(db, auth_header):
-    """PUTting an item explicitly using the autoindex filename fails validation
-    when the object key is not 'absent'.
-    """
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/foo/bar/.__exodus_autoindex",
-                    "object_key": "1" * 64,
-                }
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    # It should have failed with 400
-    assert r.status_code == 400
-
-    # It should tell the reason why
-    assert r.json() == {
-        "detail": [
-            "Value error, Invalid URI /foo/bar/.__exodus_autoindex: filename is reserved"
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_items_accepts_absent_autoindex(db, auth_header):
+def test_update_publish_items_accepts_absent_autoindex(
+    db, publish, auth_header, client
+):
     """PUTting an item explicitly using the autoindex filename is accepted if
     the object key is 'absent'.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/foo/bar/.__exodus_autoindex",
-                    "object_key": "absent",
-                }
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    publish_id = PUBLISH_ID
 
-    # It should have succeeded
-    assert r.status_code == 200
-
-    # And should have added the item normally
-    db.refresh(publish)
-    assert [(i.web_uri, i.object_key) for i in publish.items] == [
-        ("/foo/bar/.__exodus_autoindex", "absent")
-    ]
-
-
-def test_update_publish_items_link_and_key(db, auth_header):
-    """PUTting an item with both link_to and object_key fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri2",
-                    "object_key": "1" * 64,
-                    "link_to": "/uri1",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri2",
-        "object_key": "1" * 64,
-        "content_type": "",
-        "link_to": "/uri1",
-    }
-
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": [
-            "Value error, Both link target and object key present: %s"
-            % expected_item
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_items_link_content_type(db, auth_header):
-    """PUTting an item with link_to and content_type fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri2",
-                    "link_to": "/uri1",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri2",
-        "object_key": "",
-        "content_type": "application/octet-stream",
-        "link_to": "/uri1",
-    }
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": [
-            "Value error, Content type specified for link: %s" % expected_item
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_items_invalid_object_key(db, auth_header):
-    """PUTting an item with an non-sha256sum object_key fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri2",
-                    "object_key": "somethingshyof64_with!non-alphanum$",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri2",
-        "object_key": "somethingshyof64_with!non-alphanum$",
-        "content_type": "",
-        "link_to": "",
-    }
-
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": [
-            "Value error, Invalid object key; must be sha256sum: %s"
-            % expected_item
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_absent_items_with_content_type(db, auth_header):
-    """PUTting an absent item with a content type fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri1",
-                    "object_key": "absent",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri1",
-        "object_key": "absent",
-        "content_type": "application/octet-stream",
-        "link_to": "",
-    }
-
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": [
-            "Value error, Cannot set content type when object_key is 'absent': %s"
-            % expected_item
-        ]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
-
-
-def test_update_publish_items_invalid_content_type(db, auth_header):
-    """PUTting an item with a non-MIME type content type fails validation."""
-
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to add an item to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri2",
-                    "object_key": "1" * 64,
-                    "content_type": "type_nosubtype",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
-
-    expected_item = {
-        "web_uri": "/uri2",
-        "object_key": "1" * 64,
-        "content_type": "type_nosubtype",
-        "link_to": "",
-    }
-
-    # It should have failed with 400
-    assert r.status_code == 400
-    assert r.json() == {
-        "detail": ["Value error, Invalid content type: %s" % expected_item]
-    }
-    # It should include non-empty request header
-    assert len(r.headers["X-Request-ID"]) == 8
+    # Try to add an item to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/foo/bar/.__exodus_autoindex",
+                "object_key": "absent",
+            }
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
+    # It should have succeeded
+    assert r.status_code == 200
 
-def test_update_publish_items_no_publish(auth_header):
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-    with TestClient(app) as client:
-        # Try to add an item to non-existent publish
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/uri2",
-                    "object_key": "1" * 64,
-                    "content_type": "text/plain",
-                },
+    # And should have added the item normally
+    db.refresh(publish)
+    assert [(i.web_uri, i.object_key) for i in publish.items] == [
+        ("/foo/bar/.__exodus_autoindex", "absent")
+    ]
+
+
+def test_update_publish_items_no_publish(db):
+    # Try to add an item to non-existent publish
+    with pytest.raises(HTTPException) as exc_info:
+        routers.publish.update_publish_items(
+            items=[
+                schemas.ItemBase(
+                    web_uri="/uri2",
+                    object_key="1" * 64,
+                    content_type="text/plain",
+                )
             ],
-            headers=auth_header(roles=["test-publisher"]),
+            publish_id=PUBLISH_ID,
+            env=get_environment("test"),
+            db=db,
+            settings=Settings(),
+            call_context=CallContext(),
+            caller_roles={"test-publisher"},
         )
 
-    assert r.status_code == 404
-    assert r.json() == {"detail": "No publish found for ID %s" % publish_id}
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "No publish found for ID %s" % PUBLISH_ID
 
 
 @pytest.mark.parametrize(
     "deadline,commit_mode",
-    [(None, None), ("2022-07-25T15:47:47Z", None), (None, "phase1")],
-    ids=["typical", "with deadline", "phase1"],
+    [
+        (None, None),
+        ("2022-07-25T15:47:47Z", None),
+        ("2022-07-25T17:47:47+02:00", None),
+        (None, "phase1"),
+    ],
+    ids=["typical", "with deadline", "with deadline offset", "phase1"],
 )
 @freeze_time("2023-04-26 14:43:13.570034+00:00")
-def test_commit_publish(deadline, commit_mode, auth_header, db, caplog):
+def test_commit_publish(
+    deadline, commit_mode, auth_header, publish, caplog, client
+):
     """Ensure commit_publish delegates to worker and creates task."""
 
     # server is expected to apply default of phase2 if commit mode was unspecified.
     expected_commit_mode = commit_mode or "phase2"
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    url = "/test/publish/11224567-e89b-12d3-a456-426614174000/commit"
+    url = "/test/publish/%s/commit" % PUBLISH_ID
 
     params = {}
     if deadline:
@@ -912,15 +726,10 @@ def test_commit_publish(deadline, commit_mode, auth_header, db, caplog):
     if commit_mode:
         params["commit_mode"] = commit_mode
 
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
-
-        # Try to commit it
-        r = client.post(
-            url, params=params, headers=auth_header(roles=["test-publisher"])
-        )
+    # Try to commit it
+    r = client.post(
+        url, params=params, headers=auth_header(roles=["test-publisher"])
+    )
 
     # It should have succeeded
     assert r.status_code == 200
@@ -928,7 +737,7 @@ def test_commit_publish(deadline, commit_mode, auth_header, db, caplog):
     # It should return an appropriate task object
     json_r = r.json()
     assert json_r["links"]["self"] == "/task/%s" % json_r["id"]
-    assert json_r["publish_id"] == "11224567-e89b-12d3-a456-426614174000"
+    assert json_r["publish_id"] == PUBLISH_ID
     if deadline:
         # 'Z' suffix is dropped when stored as datetime in the database
         assert json_r["deadline"] == "2022-07-25T15:47:47"
@@ -937,13 +746,13 @@ def test_commit_publish(deadline, commit_mode, auth_header, db, caplog):
         (
             (
                 "Access permitted; "
-                "path=/test/publish/11224567-e89b-12d3-a456-426614174000/commit, "
+                f"path=/test/publish/{PUBLISH_ID}/commit, "
                 "user=user fake-user, role=test-publisher"
             ),
             "auth",
         ),
         (
-            f"Enqueued {expected_commit_mode} commit for '11224567-e89b-12d3-a456-426614174000'",
+            f"Enqueued {expected_commit_mode} commit for '{PUBLISH_ID}'",
             "publish",
         ),
     ]:
@@ -964,7 +773,7 @@ def test_commit_publish(deadline, commit_mode, auth_header, db, caplog):
 
 
 def test_commit_publish_phase1(
-    auth_header, db: sqlalchemy.orm.Session, caplog
+    auth_header, db: sqlalchemy.orm.Session, publish, caplog, client
 ):
     """Ensure distinct behaviors of phase1 commit:
 
@@ -973,31 +782,25 @@ def test_commit_publish_phase1(
     """
 
     commit_count = 3
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
 
-    url = "/test/publish/11224567-e89b-12d3-a456-426614174000/commit"
+    url = "/test/publish/%s/commit" % PUBLISH_ID
 
     task_ids = []
-    with TestClient(app) as client:
-        db.add(publish)
-        db.commit()
-
-        # We should be able to commit this publish *multiple* times
-        # since we're requesting a phase1 commit.
-        for _ in range(0, commit_count):
-            r = client.post(
-                url,
-                params={"commit_mode": "phase1"},
-                headers=auth_header(roles=["test-publisher"]),
-            )
 
-            # It should have succeeded
-            assert r.status_code == 200
+    # We should be able to commit this publish *multiple* times
+    # since we're requesting a phase1 commit.
+    for _ in range(0, commit_count):
+        r = client.post(
+            url,
+            params={"commit_mode": "phase1"},
+            headers=auth_header(roles=["test-publisher"]),
+        )
+
+        # It should have succeeded
+        assert r.status_code == 200
 
-            # Keep task IDs for later
-            task_ids.append(r.json()["id"])
+        # Keep task IDs for later
+        task_ids.append(r.json()["id"])
 
     # The publish object should still be PENDING.
     db.refresh(publish)
@@ -1020,44 +823,74 @@ def test_commit_publish_phase1(
         assert task.commit_mode == "phase1"
 
 
-def test_commit_publish_bad_deadline(auth_header, db):
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+def test_commit_publish_bad_deadline(auth_header, publish, client):
+    url = "/test/publish/%s/commit" % PUBLISH_ID
+    url += "?deadline=07/25/2022 3:47:47 PM"
 
-    publish = Publish(id=publish_id, env="test", state="PENDING")
+    # Try to commit it
+    r = client.post(url, headers=auth_header(roles=["test-publisher"]))
 
-    url = "/test/publish/11224567-e89b-12d3-a456-426614174000/commit"
-    url += "?deadline=07/25/2022 3:47:47 PM"
+    assert r.status_code == 400
+    assert r.json()["detail"] == (
+        "ValueError(\"Invalid isoformat string: '07/25/2022 3:47:47 PM'\")"
+    )
 
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
 
-        # Try to commit it
-        r = client.post(url, headers=auth_header(roles=["test-publisher"]))
+@pytest.mark.parametrize(
+    "deadline",
+    ["2022-07-25", "2022-07-25T15:47:47", "2022-07-25 15:47"],
+    ids=["date only", "naive", "naive no seconds"],
+)
+def test_commit_publish_deadline_no_timezone(
+    deadline, auth_header, publish, client
+):
+    """Deadlines without an explicit timezone are rejected."""
+
+    url = "/test/publish/%s/commit" % PUBLISH_ID
+
+    # Try to commit it
+    r = client.post(
+        url,
+        params={"deadline": deadline},
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     assert r.status_code == 400
     assert r.json()["detail"] == (
-        "ValueError(\"time data '07/25/2022 3:47:47 PM' does not match "
-        "format '%Y-%m-%dT%H:%M:%SZ'\")"
+        "ValueError(\"deadline '%s' has no timezone; "
+        "expected 'Z' or an offset\")" % deadline
     )
 
 
-def test_commit_publish_bad_mode(auth_header, db):
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+@pytest.mark.parametrize(
+    "deadline",
+    ["0001-01-01T00:00:00+01:00", "9999-12-31T23:59:59-01:00"],
+    ids=["before min", "after max"],
+)
+def test_commit_publish_deadline_out_of_range(
+    deadline, auth_header, publish, client
+):
+    """Deadlines which can't be represented in UTC are rejected."""
+
+    url = "/test/publish/%s/commit" % PUBLISH_ID
+
+    # Try to commit it
+    r = client.post(
+        url,
+        params={"deadline": deadline},
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
-    publish = Publish(id=publish_id, env="test", state="PENDING")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "OverflowError('date value out of range')"
 
-    url = "/test/publish/11224567-e89b-12d3-a456-426614174000/commit"
-    url += "?commit_mode=bad"
 
-    with TestClient(app) as client:
-        # ensure a publish object exists
-        db.add(publish)
-        db.commit()
+def test_commit_publish_bad_mode(auth_header, publish, client):
+    url = "/test/publish/%s/commit" % PUBLISH_ID
+    url += "?commit_mode=bad"
 
-        # Try to commit it
-        r = client.post(url, headers=auth_header(roles=["test-publisher"]))
+    # Try to commit it
+    r = client.post(url, headers=auth_header(roles=["test-publisher"]))
 
     # It should tell me the request was invalid
     assert r.status_code == 400
@@ -1078,8 +911,7 @@ def test_commit_publish_in_progress(mock_commit, fake_publish, db):
         publish_id=fake_publish.id,
         state=schemas.TaskStates.in_progress,
     )
-    db.add(fake_publish)
-    db.add(task)
+    db.add_all([fake_publish, task])
     db.commit()
 
     publish_task = routers.publish.commit_publish(
@@ -1130,9 +962,7 @@ def test_commit_publish_prev_completed(mock_commit, fake_publish, db):
 def test_commit_publish_linked_items(mock_commit, db):
     """Ensure commit_publish correctly resolves links."""
 
-    publish = Publish(
-        id="11224567-e89b-12d3-a456-426614174000", env="test", state="PENDING"
-    )
+    publish = Publish(id=PUBLISH_ID, env="test", state="PENDING")
 
     src_items = [
         Item(
@@ -1190,13 +1020,22 @@ def test_commit_publish_linked_items(mock_commit, db):
     db.add(publish)
     db.commit()
 
-    publish_task = routers.publish.commit_publish(
-        env=get_environment("test"),
-        publish_id=publish.id,
-        db=db,
-        settings=Settings(),
-        commit_mode=None,
-    )
+    publish_id = publish.id
+    env = get_environment("test")
+
+    with recorded_statements(db.get_bind()) as statements:
+        publish_task = routers.publish.commit_publish(
+            env=env,
+            publish_id=publish_id,
+            db=db,
+            settings=Settings(),
+            commit_mode=None,
+        )
+
+    # Links should've been resolved with a fixed number of queries
+    # regardless of the number of items: one for the publish, one for
+    # the link items and one for their targets.
+    assert len(statements) == 3
 
     # Should've filled object_key, content_type from source item and unset link_to fields.
     for idx, item in enumerate(ln_items):
@@ -1245,14 +1084,22 @@ def test_commit_publish_unresolved_links(mock_commit, fake_publish, db):
     db.add(fake_publish)
     db.commit()
 
-    with pytest.raises(HTTPException) as exc_info:
-        routers.publish.commit_publish(
-            env=get_environment("test"),
-            publish_id=fake_publish.id,
-            db=db,
-            settings=Settings(),
-            commit_mode=None,
-        )
+    publish_id = fake_publish.id
+    env = get_environment("test")
+
+    with recorded_statements(db.get_bind()) as statements:
+        with pytest.raises(HTTPException) as exc_info:
+            routers.publish.commit_publish(
+                env=env,
+                publish_id=publish_id,
+                db=db,
+                settings=Settings(),
+                commit_mode=None,
+            )
+
+    # It should have queried the publish, link items and link targets
+    # without loading the publish's items one by one.
+    assert len(statements) == 3
 
     assert exc_info.value.status_code == 400
     assert (
@@ -1264,18 +1111,22 @@ def test_commit_publish_unresolved_links(mock_commit, fake_publish, db):
     mock_commit.assert_not_called()
 
 
-def test_commit_no_publish(auth_header):
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-    url = "/test/publish/%s/commit" % publish_id
-    with TestClient(app) as client:
-        # Try to commit non-existent publish
-        r = client.post(url, headers=auth_header(roles=["test-publisher"]))
+def test_commit_no_publish(db):
+    # Try to commit non-existent publish
+    with pytest.raises(HTTPException) as exc_info:
+        routers.publish.commit_publish(
+            env=get_environment("test"),
+            publish_id=PUBLISH_ID,
+            db=db,
+            settings=Settings(),
+            commit_mode=None,
+        )
 
-    assert r.status_code == 404
-    assert r.json() == {"detail": "No publish found for ID %s" % publish_id}
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "No publish found for ID %s" % PUBLISH_ID
 
 
-def test_commit_env_mismatch(auth_header, fake_publish, db):
+def test_commit_env_mismatch(auth_header, fake_publish, db, client):
     """Ensure we can't operate on publishes belonging to other environments"""
 
     fake_publish.env = "pre"
@@ -1283,8 +1134,7 @@ def test_commit_env_mismatch(auth_header, fake_publish, db):
     db.commit()
 
     url = "/test/publish/%s/commit" % fake_publish.id
-    with TestClient(app) as client:
-        r = client.post(url, headers=auth_header(roles=["test-publisher"]))
+    r = client.post(url, headers=auth_header(roles=["test-publisher"]))
 
     assert r.status_code == 404
     assert r.json() == {
@@ -1292,10 +1142,10 @@ def test_commit_env_mismatch(auth_header, fake_publish, db):
     }
 
 
-def test_get_publish_typical(auth_header, db):
+def test_get_publish_typical(auth_header, db, client):
     """GETing an existing publish returns a publish with no items."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
     publish = Publish(
         id=publish_id,
@@ -1315,42 +1165,40 @@ def test_get_publish_typical(auth_header, db):
         ],
     )
 
-    with TestClient(app) as client:
-        # Ensure a publish object exists
-        db.add(publish)
-        db.commit()
+    # Ensure a publish object exists
+    db.add(publish)
+    db.commit()
 
-        # Try to add some items to it
-        r = client.get(
-            "/test/publish/%s" % publish_id,
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.get(
+        "/test/publish/%s" % publish_id,
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
 
     # Returned publish does not contain items
     assert r.json() == {
-        "id": "11224567-e89b-12d3-a456-426614174000",
+        "id": PUBLISH_ID,
         "env": "test",
         "state": "PENDING",
         "updated": None,
         "links": {
-            "self": "/test/publish/11224567-e89b-12d3-a456-426614174000",
-            "commit": "/test/publish/11224567-e89b-12d3-a456-426614174000/commit",
+            "self": "/test/publish/%s" % PUBLISH_ID,
+            "commit": "/test/publish/%s/commit" % PUBLISH_ID,
         },
         "items": [],
     }
 
 
-def test_get_publish_not_found(auth_header, fake_publish):
+def test_get_publish_not_found(auth_header, fake_publish, client):
     """GETing a non-existent publish returns an appropriate error message."""
 
-    with TestClient(app) as client:
-        r = client.get(
-            "/test/publish/%s" % fake_publish.id,
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    r = client.get(
+        "/test/publish/%s" % fake_publish.id,
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have failed
     assert r.status_code == 404
@@ -1359,7 +1207,9 @@ def test_get_publish_not_found(auth_header, fake_publish):
     }
 
 
-def test_update_user_authorized_publish_paths(db, auth_header, monkeypatch):
+def test_update_user_authorized_publish_paths(
+    publish, auth_header, monkeypatch
+):
     """Ensure that a user can successfully publish content to any paths to
     which they are authorized to publish."""
 
@@ -1377,12 +1227,7 @@ def test_update_user_authorized_publish_paths(db, auth_header, monkeypatch):
         ),
     )
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
     with TestClient(app) as client:
         # Try to add some items to it
@@ -1407,7 +1252,9 @@ def test_update_user_authorized_publish_paths(db, auth_header, monkeypatch):
     assert r.status_code == 200
 
 
-def test_update_user_unauthorized_publish_paths(db, auth_header, monkeypatch):
+def test_update_user_unauthorized_publish_paths(
+    publish, auth_header, monkeypatch
+):
     """When a user is only authorized to publish to certain paths in a given
     CDN environment, ensure that the user is prevented from publishing to any
     paths to which they are unauthorized to publish."""
@@ -1426,12 +1273,7 @@ def test_update_user_unauthorized_publish_paths(db, auth_header, monkeypatch):
         ),
     )
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
     with TestClient(app) as client:
         # Try to add some items to it
@@ -1459,7 +1301,7 @@ def test_update_user_unauthorized_publish_paths(db, auth_header, monkeypatch):
     }
 
 
-def test_update_invalid_path_unmatched_regex(db, auth_header):
+def test_update_invalid_path_unmatched_regex(publish, auth_header, client):
     """When a user publishes to a /content/origin/ path, ensure that the the web_uri
     matches a regex which enforces the following format:
     /origin/files/sha256/(first two letters of sha256sum)/(full sha256sum)/(basename)
@@ -1468,26 +1310,20 @@ def test_update_invalid_path_unmatched_regex(db, auth_header):
     the defined regex pattern, the request is denied with a 400 response.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/content/origin/files/sha256/01/44/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                    "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/content/origin/files/sha256/01/44/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+                "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have failed
     assert r.status_code == 400
@@ -1500,34 +1336,26 @@ def test_update_invalid_path_unmatched_regex(db, auth_header):
 
 
 def test_update_invalid_origin_files_bypassed(
-    db, auth_header, caplog: pytest.LogCaptureFixture
+    publish, auth_header, caplog: pytest.LogCaptureFixture, client
 ):
     """When a user publishes to a /content/origin/ path and violates the policy,
     the violation is allowed if the user has {env}-ignore-policy role.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/content/origin/files/sha256/01/44/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                    "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(
-                roles=["test-publisher", "test-ignore-policy"]
-            ),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/content/origin/files/sha256/01/44/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+                "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher", "test-ignore-policy"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
@@ -1542,32 +1370,26 @@ def test_update_invalid_origin_files_bypassed(
     )
 
 
-def test_update_invalid_path_sha256sum_mismatch(db, auth_header):
+def test_update_invalid_path_sha256sum_mismatch(publish, auth_header, client):
     """When a user publishes to a /content/origin/ path, ensure that the two-character
     portion of the web_uri matches the first two characters of the sha256sum portion of the
     web_uri. When they do not match, the request is denied with a 400 response.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/content/origin/files/sha256/00/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                    "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/content/origin/files/sha256/00/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+                "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have failed
     assert r.status_code == 400
@@ -1580,31 +1402,25 @@ def test_update_invalid_path_sha256sum_mismatch(db, auth_header):
     }
 
 
-def test_update_invalid_path_invalid_object_key(db, auth_header):
+def test_update_invalid_path_invalid_object_key(publish, auth_header, client):
     """When a user publishes to a /content/origin/ path, ensure that the object_key matches
     the sha256sum included in the web_uri. When they do not match, the request is denied
     with a 400 response."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                    "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+                "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have failed
     assert r.status_code == 400
@@ -1616,10 +1432,12 @@ def test_update_invalid_path_invalid_object_key(db, auth_header):
     }
 
 
-def test_update_publish_items_origin_paths_typical_link_to(db, auth_header):
+def test_update_publish_items_origin_paths_typical_link_to(
+    db, auth_header, client
+):
     """Ensure that the /origin/files/ invariant is respected when an item uses link_to."""
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
+    publish_id = PUBLISH_ID
 
     publish = Publish(id=publish_id, env="test", state="PENDING")
 
@@ -1643,76 +1461,71 @@ def test_update_publish_items_origin_paths_typical_link_to(db, auth_header):
     db.add(publish)
     db.commit()
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                    "object_key": "0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-                {
-                    "web_uri": "/origin/files/sha256/01/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-1.rpm",
-                    "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
-                    "content_type": "application/octet-stream",
-                },
-                {
-                    "web_uri": "/content/origin/files/sha256/02/0244062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-2.rpm",
-                    "object_key": "absent",
-                },
-                {
-                    # This item links to an item in the request.
-                    "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
-                    "link_to": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
-                },
-                {
-                    # This item links to an item in the db.
-                    "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test-5.rpm",
-                    "link_to": "/content/origin/files/sha256/05/0544062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-5.rpm",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+                "object_key": "0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+            {
+                "web_uri": "/origin/files/sha256/01/0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-1.rpm",
+                "object_key": "0144062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a",
+                "content_type": "application/octet-stream",
+            },
+            {
+                "web_uri": "/content/origin/files/sha256/02/0244062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-2.rpm",
+                "object_key": "absent",
+            },
+            {
+                # This item links to an item in the request.
+                "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
+                "link_to": "/content/origin/files/sha256/00/0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test.rpm",
+            },
+            {
+                # This item links to an item in the db.
+                "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test-5.rpm",
+                "link_to": "/content/origin/files/sha256/05/0544062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-5.rpm",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 200
 
 
-def test_update_publish_items_origin_paths_invalid_link_to(db, auth_header):
+def test_update_publish_items_origin_paths_invalid_link_to(
+    publish, auth_header, client
+):
     """Ensure that the /origin/files/ invariant is respected when an item uses link_to.
     When publishing an item using link_to, if the web_uri of the link publishes under /content/origin,
     the web_uri must contain the target's object_key. When the target's object_key is not included in
     the web_uri of the item using link_to, the request is denied with a 400 response.
     """
 
-    publish_id = "11224567-e89b-12d3-a456-426614174000"
-
-    publish = Publish(id=publish_id, env="test", state="PENDING")
-
-    db.add(publish)
-    db.commit()
+    publish_id = PUBLISH_ID
 
-    with TestClient(app) as client:
-        # Try to add some items to it
-        r = client.put(
-            "/test/publish/%s" % publish_id,
-            json=[
-                {
-                    "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
-                    "object_key": "0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658bbb",
-                    "content_type": "application/octet-stream",
-                },
-                {
-                    # This item links to another item in the same request. The item it links to contains an
-                    # object_key that does not match the sha256sum included in this item's web_uri.
-                    "web_uri": "/content/origin/files/sha256/03/0344062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-3.rpm",
-                    "link_to": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
-                },
-            ],
-            headers=auth_header(roles=["test-publisher"]),
-        )
+    # Try to add some items to it
+    r = client.put(
+        "/test/publish/%s" % publish_id,
+        json=[
+            {
+                "web_uri": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
+                "object_key": "0044062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658bbb",
+                "content_type": "application/octet-stream",
+            },
+            {
+                # This item links to another item in the same request. The item it links to contains an
+                # object_key that does not match the sha256sum included in this item's web_uri.
+                "web_uri": "/content/origin/files/sha256/03/0344062dca731c0d5c24148722537e181d752ca8cda0097005f9268a51658b0a/test-3.rpm",
+                "link_to": "/my-repo/x86_64/variant/os/Packages/t/test.rpm",
+            },
+        ],
+        headers=auth_header(roles=["test-publisher"]),
+    )
 
     # It should have succeeded
     assert r.status_code == 400
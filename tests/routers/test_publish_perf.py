@@ -3,9 +3,6 @@ from hashlib import sha256
 from itertools import islice
 from typing import TypeVar
 
-from fastapi.testclient import TestClient
-
-from exodus_gw.main import app
 from exodus_gw.models import Publish
 
 T = TypeVar("T")
@@ -41,7 +38,7 @@ def batched(iterable: Iterable[T], n: int):
         yield batch
 
 
-def test_update_publish_items_large(db, auth_header):
+def test_update_publish_items_large(db, auth_header, client):
     """Performance test putting a large number of items onto a publish."""
 
     publish_id = "11224567-e89b-12d3-a456-426614174000"
@@ -76,23 +73,57 @@ def test_update_publish_items_large(db, auth_header):
     batched_origin_items = batched(all_origin_items, batch_size)
     batched_package_items = batched(all_package_items, batch_size)
 
-    with TestClient(app) as client:
-        for batch in batched_origin_items:
-            r = client.put(
-                "/test/publish/%s" % publish_id,
-                json=batch,
-                headers=auth_header(roles=["test-publisher"]),
-            )
-            assert r.status_code == 200
-
-        for batch in batched_package_items:
-            r = client.put(
-                "/test/publish/%s" % publish_id,
-                json=batch,
-                headers=auth_header(roles=["test-publisher"]),
-            )
-            assert r.status_code == 200
+    for batch in batched_origin_items:
+        r = client.put(
+            "/test/publish/%s" % publish_id,
+            json=batch,
+            headers=auth_header(roles=["test-publisher"]),
+        )
+        assert r.status_code == 200
+
+    for batch in batched_package_items:
+        r = client.put(
+            "/test/publish/%s" % publish_id,
+            json=batch,
+            headers=auth_header(roles=["test-publisher"]),
+        )
+        assert r.status_code == 200
 
     # Verify expected number of items were added
     db.refresh(publish)
     assert len(publish.items) == package_count * 2
+
+
+def test_update_publish_items_large_with_links(db, auth_header, client):
+    """Performance test putting a large number of items onto a publish,
+    where link items and their targets arrive in the same request.
+    """
+
+    publish_id = "11224567-e89b-12d3-a456-426614174000"
+
+    publish = Publish(id=publish_id, env="test", state="PENDING")
+    db.add(publish)
+    db.commit()
+
+    # Each batch holds both the origin items and the package items linking
+    # to them, so that all links are resolved among the incoming items.
+    package_count = 10000
+    batch_size = 5000
+
+    batches = zip(
+        batched(origin_items(package_count), batch_size),
+        batched(package_items(package_count), batch_size),
+    )
+
+    for origin_batch, package_batch in batches:
+        r = client.put(
+            "/test/publish/%s" % publish_id,
+            json=origin_batch + package_batch,
+            headers=auth_header(roles=["test-publisher"]),
+        )
+        assert r.status_code == 200
+
+    # Verify expected number of items were added, with all links resolved
+    db.refresh(publish)
+    assert len(publish.items) == package_count * 2
+    assert not [i for i in publish.items if i.link_to]
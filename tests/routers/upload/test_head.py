@@ -48,7 +48,7 @@ async def test_head(mock_aws_client, auth_header, monkeypatch):
     assert r.headers["x-request-id"]
 
 
-async def test_head_nonexistent_key(mock_aws_client, auth_header):
+async def test_head_nonexistent_key(mock_aws_client, auth_header, client):
     """Head handles 404 responses correctly."""
 
     mock_aws_client.head_object.side_effect = ClientError(
@@ -64,10 +64,9 @@ async def test_head_nonexistent_key(mock_aws_client, auth_header):
         "HeadObject",
     )
 
-    with TestClient(app) as client:
-        r = client.head(
-            "/upload/test/%s" % TEST_KEY,
-            headers=auth_header(roles=["test-blob-uploader"]),
-        )
+    r = client.head(
+        "/upload/test/%s" % TEST_KEY,
+        headers=auth_header(roles=["test-blob-uploader"]),
+    )
 
     assert r.status_code == 404
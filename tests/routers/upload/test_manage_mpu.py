@@ -1,18 +1,15 @@
 import textwrap
-
-import mock
-from fastapi.testclient import TestClient
+from unittest import mock
 
 from exodus_gw.aws.util import xml_response
 from exodus_gw.deps import get_environment, get_s3_client
-from exodus_gw.main import app
 from exodus_gw.routers.upload import multipart_upload
 from exodus_gw.settings import load_settings
 
 TEST_KEY = "b5bb9d8014a0f9b1d61e21e796d78dccdf1352f23cd32812f4850b878ae4944c"
 
 
-async def test_create_mpu(mock_aws_client, auth_header):
+async def test_create_mpu(mock_aws_client, auth_header, client):
     """Creating a multipart upload is delegated correctly to S3."""
 
     mock_aws_client.create_multipart_upload.return_value = {
@@ -21,11 +18,10 @@ async def test_create_mpu(mock_aws_client, auth_header):
         "UploadId": "my-great-upload",
     }
 
-    with TestClient(app) as client:
-        r = client.post(
-            "/upload/test/%s?uploads" % TEST_KEY,
-            headers=auth_header(roles=["test-blob-uploader"]),
-        )
+    r = client.post(
+        "/upload/test/%s?uploads" % TEST_KEY,
+        headers=auth_header(roles=["test-blob-uploader"]),
+    )
 
     # It should succeed
     assert r.status_code == 200
@@ -122,14 +118,13 @@ async def test_complete_mpu(mock_aws_client):
     assert response.body == expected
 
 
-async def test_bad_mpu_call(auth_header):
+async def test_bad_mpu_call(auth_header, client):
     """Mixing uploadId and uploads arguments gives a validation error."""
 
-    with TestClient(app) as client:
-        r = client.post(
-            "/upload/test/%s?uploads&uploadId=my-upload" % TEST_KEY,
-            headers=auth_header(roles=["test-blob-uploader"]),
-        )
+    r = client.post(
+        "/upload/test/%s?uploads&uploadId=my-upload" % TEST_KEY,
+        headers=auth_header(roles=["test-blob-uploader"]),
+    )
 
     assert r.status_code == 400
     assert r.content == (
@@ -143,14 +138,13 @@ async def test_bad_mpu_call(auth_header):
     assert r.headers["X-Request-ID"]
 
 
-async def test_abort_mpu(mock_aws_client, auth_header):
+async def test_abort_mpu(mock_aws_client, auth_header, client):
     """Aborting a multipart upload is correctly delegated to S3."""
 
-    with TestClient(app) as client:
-        r = client.delete(
-            "/upload/test/%s?uploadId=my-lame-upload" % TEST_KEY,
-            headers=auth_header(roles=["test-blob-uploader"]),
-        )
+    r = client.delete(
+        "/upload/test/%s?uploadId=my-lame-upload" % TEST_KEY,
+        headers=auth_header(roles=["test-blob-uploader"]),
+    )
 
     # It should be a successful, empty response
     assert r.status_code == 200
@@ -1,4 +1,5 @@
-import mock
+from unittest import mock
+
 import pytest
 from botocore.exceptions import ClientError
 from fastapi.testclient import TestClient
@@ -55,17 +56,18 @@ async def test_full_upload(
     assert r.content == b""
 
 
-async def test_part_upload(mock_aws_client, mock_request_reader, auth_header):
+async def test_part_upload(
+    mock_aws_client, mock_request_reader, auth_header, client
+):
     """Uploading part of an object is delegated correctly to S3."""
 
     mock_request_reader.return_value = b"best bytes"
     mock_aws_client.upload_part.return_value = {"ETag": "a1b2c3"}
 
-    with TestClient(app) as client:
-        r = client.put(
-            "/upload/test/%s?uploadId=my-upload&partNumber=88" % TEST_KEY,
-            headers=auth_header(roles=["test-blob-uploader"]),
-        )
+    r = client.put(
+        "/upload/test/%s?uploadId=my-upload&partNumber=88" % TEST_KEY,
+        headers=auth_header(roles=["test-blob-uploader"]),
+    )
 
     # It should succeed
     assert r.status_code == 200
@@ -119,7 +121,9 @@ async def test_upload_invalid_metadata(
     assert err_msg in r.text
 
 
-async def test_put_error(mock_aws_client, mock_request_reader, auth_header):
+async def test_put_error(
+    mock_aws_client, mock_request_reader, auth_header, client
+):
     """An error response on an upload to S3 is passed back to the client correctly."""
 
     headers = auth_header(roles=["test-blob-uploader"])
@@ -139,8 +143,7 @@ async def test_put_error(mock_aws_client, mock_request_reader, auth_header):
         "PutObject",
     )
 
-    with TestClient(app) as client:
-        r = client.put("/upload/test/%s" % TEST_KEY, headers=headers)
+    r = client.put("/upload/test/%s" % TEST_KEY, headers=headers)
 
     # It should fail, with same status as in the boto error
     assert r.status_code == 412
@@ -0,0 +1,51 @@
+import pytest
+
+from exodus_gw.schemas import SHA256SUM_PATTERN, normalize_path
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("", ""),
+        ("/", "/"),
+        ("/some/path", "/some/path"),
+        ("some/path", "/some/path"),
+        ("/some/path/", "/some/path"),
+        ("/some//path", "/some/path"),
+        ("///some/path", "/some/path"),
+        ("/some/./path", "/some/path"),
+        ("/some/path/.", "/some/path"),
+        ("/some/other/../path", "/some/path"),
+        ("/some/path/..", "/some"),
+        ("./some/path", "/some/path"),
+        ("/some/.hidden/path", "/some/.hidden/path"),
+        ("/some/..hidden/path", "/some/..hidden/path"),
+        ("/some/path/...", "/some/path/..."),
+        ("/some/.__exodus_autoindex", "/some/.__exodus_autoindex"),
+    ],
+)
+def test_normalize_path(path, expected):
+    """normalize_path gives an absolute, normalized path."""
+
+    assert normalize_path(path) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("1" * 64, True),
+        ("0123456789abcdef" * 4, True),
+        ("", False),
+        ("1" * 63, False),
+        ("1" * 65, False),
+        ("A" * 64, False),
+        ("g" * 64, False),
+        ("1" * 64 + "\n", False),
+        ("1" * 64 + "garbage", False),
+        ("somethingshyof64_with!non-alphanum$", False),
+    ],
+)
+def test_sha256sum_pattern(value, expected):
+    """SHA256SUM_PATTERN fully matches only 64 lowercase hex digits."""
+
+    assert bool(SHA256SUM_PATTERN.fullmatch(value)) is expected
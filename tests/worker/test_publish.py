@@ -2,8 +2,8 @@ import logging
 import queue
 import uuid
 from datetime import datetime, timedelta
+from unittest import mock
 
-import mock
 import pytest
 import sqlalchemy.orm
 from sqlalchemy import not_